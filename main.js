@@ -27,122 +27,23 @@ const NODE_BUILTIN_MODULES = new Set([
   'node:vm', 'node:wasi', 'node:worker_threads', 'node:zlib'
 ]);
 
-// Validate command-line arguments
-if (process.argv.length < 3) {
-  console.error('Usage: node scan.js <target-directory> [output-file]');
-  process.exit(1);
-}
-
-const rootDir = path.resolve(process.argv[2]);
-const outputFile = process.argv[3] || 'available-packages.txt';
-
-// Store package occurrences with file paths
-const packageOccurrences = new Map();
-
-/**
- * Recursively collect all JavaScript and TypeScript files under a directory
- */
-async function findFiles(dir) {
-  let results = [];
-  try {
-    const entries = await fs.readdir(dir);
-    
-    for (const entry of entries) {
-      const fullPath = path.join(dir, entry);
-      
-      // Skip node_modules, dist, build, and hidden directories
-      if (entry === 'node_modules' || entry === 'dist' || entry === 'build' || entry.startsWith('.')) {
-        continue;
-      }
-      
-      try {
-        const stat = await fs.stat(fullPath);
-        
-        if (stat.isDirectory()) {
-          const subFiles = await findFiles(fullPath);
-          results = results.concat(subFiles);
-        } else if (stat.isFile() && /\.(js|jsx|ts|tsx|cjs|mjs)$/.test(fullPath)) {
-          results.push(fullPath);
-        }
-      } catch (err) {
-        continue;
-      }
-    }
-  } catch (err) {
-    console.warn(`Warning: Unable to read directory ${dir}`);
-  }
-  return results;
-}
-
-/**
- * Enhanced package name validation
- */
-function isValidPackageName(name) {
-  // Skip relative/absolute paths and Node.js built-ins
-  if (name.startsWith('.') || 
-      name.startsWith('/') ||
-      //name.startsWith('@') ||
-      name.startsWith('node:') ||
-      NODE_BUILTIN_MODULES.has(name)) {
-    return false;
-  }
-  
-  // Skip common non-package imports
-      const skipPatterns = [
-    /^https?:\/\//, // URLs
-    /^\.\.?\//,     // Relative paths
-    /^[a-z]:/i,     // Windows drive letters
-    /^\#/,           // Import maps/package imports
-    /^file:\/\//,   // File URLs
-  ];
-  
-  // Filter out invalid single characters and special patterns
-  if (/^[^a-zA-Z0-9@]/.test(name) || /^[*~!@#$%^&()+={\}[\]|:;"'<>,?/`]$/.test(name)) {
-    return false;
-  }
+// Directories never descended into while collecting source files
+const SKIP_DIRS = new Set(['node_modules', 'dist', 'build']);
+const SOURCE_FILE_RE = /\.(js|jsx|ts|tsx|cjs|mjs)$/;
 
-  // NEW: Filter out package names with capital letters (npm doesn't allow them)
-  if (/[A-Z]/.test(name)) {
-    return false;
-  }
-   
-  // Additional npm package naming validation
-  if (name.length === 0 || name.length > 214) return false;
-  if (!/^[a-zA-Z0-9][a-zA-Z0-9._-]*$/.test(name)) return false;
-  
-  return !skipPatterns.some(pattern => pattern.test(name));
-}
+// Common non-package imports
+const SKIP_PATTERNS = [
+  /^https?:\/\//, // URLs
+  /^\.\.?\//,     // Relative paths
+  /^[a-z]:/i,     // Windows drive letters
+  /^\#/,           // Import maps/package imports
+  /^file:\/\//,   // File URLs
+];
 
 /**
- * Enhanced package name normalization with slash counting
- */
-function normalizePackageName(packageName) {
-  // Handle scoped packages (@scope/name) - always allow any number of slashes
-  if (packageName.startsWith('@') && packageName.includes('/')) {
-    const parts = packageName.split('/');
-    return parts.slice(0, 2).join('/');
-  }
-  
-  // For non-scoped packages, count the slashes
-  if (!packageName.startsWith('@')) {
-    const slashCount = (packageName.match(/\//g) || []).length;
-    
-    // If there are 2 or more slashes, it's likely a local path
-    if (slashCount >= 2) {
-      return null;
-    }
-    
-    // If there's exactly 1 slash, it's likely a deep import (like lodash/map)
-    // Extract just the package name part
- //   return packageName.split('/')[0]; -> 
-//  } ->
-    const firstPart = packageName.split('/')[0];
-    
-    // Filter out obvious local directory names
-    /**
  * Comprehensive local directory and build artifact patterns
  */
-const localPatterns = [
+const LOCAL_DIR_NAMES = new Set([
   // Build and output directories
   'dist', 'build', 'out', 'target', 'bin', 'output', 'release', 'releases',
   'debug', 'release', 'prod', 'production', 'stage', 'staging', 'dev', 'development',
@@ -254,9 +155,119 @@ const localPatterns = [
   'signer', 'signers', 'verifier', 'verifiers', 'authenticator', 'authenticators',
   'authorizer', 'authorizers', 'guard', 'guards', 'protector', 'protectors',
   'validator', 'validators', 'sanitizer', 'sanitizers', 'normalizer', 'normalizers'
-];
+]);
+
+// Validate command-line arguments
+if (process.argv.length < 3) {
+  console.error('Usage: node scan.js <target-directory> [output-file]');
+  process.exit(1);
+}
+
+const rootDir = path.resolve(process.argv[2]);
+const outputFile = process.argv[3] || 'available-packages.txt';
+
+// Store package occurrences with file paths
+const packageOccurrences = new Map();
+
+// Shared keep-alive agent so registry lookups reuse TLS connections
+const registryAgent = new https.Agent({ keepAlive: true, maxSockets: 3 });
+const MAX_RATE_LIMIT_RETRIES = 3;
+
+/**
+ * Recursively collect all JavaScript and TypeScript files under a directory
+ */
+async function findFiles(dir) {
+  let results = [];
+  try {
+    // withFileTypes avoids a stat() syscall per entry for regular files/dirs
+    const entries = await fs.readdir(dir, { withFileTypes: true });
+    
+    for (const entry of entries) {
+      const name = entry.name;
+      const fullPath = path.join(dir, name);
+      
+      // Skip node_modules, dist, build, and hidden directories
+      if (SKIP_DIRS.has(name) || name.startsWith('.')) {
+        continue;
+      }
+      
+      try {
+        // Only symlinks still need a stat() to learn what they point at
+        const stat = entry.isSymbolicLink() ? await fs.stat(fullPath) : entry;
+        
+        if (stat.isDirectory()) {
+          const subFiles = await findFiles(fullPath);
+          results = results.concat(subFiles);
+        } else if (stat.isFile() && SOURCE_FILE_RE.test(name)) {
+          results.push(fullPath);
+        }
+      } catch (err) {
+        continue;
+      }
+    }
+  } catch (err) {
+    console.warn(`Warning: Unable to read directory ${dir}`);
+  }
+  return results;
+}
+
+/**
+ * Enhanced package name validation
+ */
+function isValidPackageName(name) {
+  // Skip relative/absolute paths and Node.js built-ins
+  if (name.startsWith('.') || 
+      name.startsWith('/') ||
+      //name.startsWith('@') ||
+      name.startsWith('node:') ||
+      NODE_BUILTIN_MODULES.has(name)) {
+    return false;
+  }
+  
+  // Filter out invalid single characters and special patterns
+  if (/^[^a-zA-Z0-9@]/.test(name) || /^[*~!@#$%^&()+={\}[\]|:;"'<>,?/`]$/.test(name)) {
+    return false;
+  }
+
+  // NEW: Filter out package names with capital letters (npm doesn't allow them)
+  if (/[A-Z]/.test(name)) {
+    return false;
+  }
+   
+  // Additional npm package naming validation
+  if (name.length === 0 || name.length > 214) return false;
+  if (!/^[a-zA-Z0-9][a-zA-Z0-9._-]*$/.test(name)) return false;
+  
+  return !SKIP_PATTERNS.some(pattern => pattern.test(name));
+}
+
+/**
+ * Enhanced package name normalization with slash counting
+ */
+function normalizePackageName(packageName) {
+  // Handle scoped packages (@scope/name) - always allow any number of slashes
+  if (packageName.startsWith('@') && packageName.includes('/')) {
+    const parts = packageName.split('/');
+    return parts.slice(0, 2).join('/');
+  }
+  
+  // For non-scoped packages, count the slashes
+  if (!packageName.startsWith('@')) {
+    const slashCount = (packageName.match(/\//g) || []).length;
+    
+    // If there are 2 or more slashes, it's likely a local path
+    if (slashCount >= 2) {
+      return null;
+    }
+    
+    // If there's exactly 1 slash, it's likely a deep import (like lodash/map)
+    // Extract just the package name part
+ //   return packageName.split('/')[0]; -> 
+//  } ->
+    const firstPart = packageName.split('/')[0];
     
-    if (localPatterns.includes(firstPart)) {
+    // Filter out obvious local directory names
+    if (LOCAL_DIR_NAMES.has(firstPart)) {
       return null;
     }
     
@@ -280,6 +291,12 @@ async function extractImports(filePath) {
     return pkgNames;
   }
   
+  // Files with none of these keywords cannot contain an import/require/export,
+  // so skip the (much more expensive) AST parse entirely
+  if (!code.includes('import') && !code.includes('require') && !code.includes('export')) {
+    return pkgNames;
+  }
+  
   let ast;
   try {
     ast = parser.parse(code, {
@@ -371,12 +388,23 @@ function trackPackageOccurrence(rawPackageName, filePath) {
 /**
  * Check package availability using HTTPS
  */
-function checkPackageAvailability(name) {
+function checkPackageAvailability(name, attempt = 0) {
   return new Promise((resolve) => {
     const url = `https://registry.npmjs.org/${encodeURIComponent(name)}`;
     
-    const req = https.get(url, (res) => {
-      if (res.statusCode === 404) {
+    const req = https.get(url, { agent: registryAgent }, (res) => {
+      // Drain the body so the socket returns to the keep-alive pool
+      res.resume();
+      if (res.statusCode === 429) {
+        // Rate limited: back off for as long as the registry asks, then retry
+        if (attempt >= MAX_RATE_LIMIT_RETRIES) {
+          resolve({ name, status: 'Error', error: 'Rate limited' });
+          return;
+        }
+        const retryAfter = parseInt(res.headers['retry-after'], 10);
+        const delay = Number.isNaN(retryAfter) ? 1000 * 2 ** attempt : retryAfter * 1000;
+        setTimeout(() => resolve(checkPackageAvailability(name, attempt + 1)), delay);
+      } else if (res.statusCode === 404) {
         resolve({ name, status: 'Available', error: null });
       } else {
         resolve({ name, status: 'Taken', error: null });
@@ -398,21 +426,25 @@ function checkPackageAvailability(name) {
  * Check multiple packages with concurrency control
  */
 async function checkPackagesBatch(packageNames) {
-  const results = [];
-  const BATCH_SIZE = 3;
-  
-  for (let i = 0; i < packageNames.length; i += BATCH_SIZE) {
-    const batch = packageNames.slice(i, i + BATCH_SIZE);
-    const batchPromises = batch.map(name => checkPackageAvailability(name));
-    
-    const batchResults = await Promise.all(batchPromises);
-    results.push(...batchResults);
-    
-    if (i + BATCH_SIZE < packageNames.length) {
-      await new Promise(resolve => setTimeout(resolve, 200));
+  const results = new Array(packageNames.length);
+  const CONCURRENCY = 3;
+  let next = 0;
+
+  // Each worker pulls the next name as soon as its previous request settles,
+  // so one slow lookup no longer stalls the rest of its batch
+  async function worker() {
+    while (next < packageNames.length) {
+      const i = next++;
+      results[i] = await checkPackageAvailability(packageNames[i]);
     }
   }
-  
+
+  const workers = [];
+  for (let w = 0; w < Math.min(CONCURRENCY, packageNames.length); w++) {
+    workers.push(worker());
+  }
+  await Promise.all(workers);
+
   return results;
 }
 